@@ -0,0 +1,42 @@
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Dict, Hashable, List
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.lower() for token in TOKEN_PATTERN.findall(text)]
+
+
+class InvertedIndex:
+    def __init__(self):
+        self.postings: Dict[str, Dict[Hashable, int]] = defaultdict(dict)
+        self.documents: Dict[Hashable, List[str]] = {}
+
+    def add(self, doc_id: Hashable, text: str) -> None:
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        for term, count in terms.items():
+            self.postings[term][doc_id] = count
+        self.documents[doc_id] = list(terms)
+
+    def remove(self, doc_id: Hashable) -> None:
+        for term in self.documents.pop(doc_id, []):
+            self.postings[term].pop(doc_id, None)
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def search(self, query: str, limit: int = 20, skip: int = 0) -> List[Hashable]:
+        scores: Dict[Hashable, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            matches = self.postings.get(term)
+            if not matches:
+                continue
+            idf = math.log(1 + len(self.documents) / len(matches))
+            for doc_id, count in matches.items():
+                scores[doc_id] += count * idf
+
+        ranked = sorted(scores, key=lambda doc_id: -scores[doc_id])
+        return ranked[skip:skip + limit]
@@ -1,6 +1,8 @@
-from typing import List
+import os
+from typing import List, Optional
 
-from fastapi import APIRouter, Body, HTTPException, status
+from database.search import InvertedIndex
+from fastapi import APIRouter, Body, HTTPException, Query, status
 from models.events import Event
 
 event_router = APIRouter(
@@ -8,6 +10,7 @@ event_router = APIRouter(
 )
 
 events = []
+search_index: Optional[InvertedIndex] = InvertedIndex() if os.getenv("EVENT_SEARCH", "on") == "on" else None
 
 
 @event_router.get("/", response_model=List[Event])
@@ -15,6 +18,19 @@ async def retrieve_all_events() -> List[Event]:
     return events
 
 
+@event_router.get("/search", response_model=List[Event])
+async def search_events(q: str = Query(..., min_length=1),
+                        limit: int = Query(20, ge=1, le=100),
+                        skip: int = Query(0, ge=0)) -> List[Event]:
+    if search_index is None:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Event search is not enabled"
+        )
+    events_by_id = {event.id: event for event in events}
+    return [events_by_id[id] for id in search_index.search(q, limit, skip)]
+
+
 @event_router.get("/{id}", response_model=Event)
 async def retrieve_event(id: int) -> Event:
     for event in events:
@@ -28,7 +44,14 @@ async def retrieve_event(id: int) -> Event:
 
 @event_router.post("/new")
 async def create_event(body: Event = Body(...)) -> dict:
+    if any(event.id == body.id for event in events):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Event with supplied ID exists already"
+        )
     events.append(body)
+    if search_index is not None:
+        search_index.add(body.id, " ".join([body.title, body.description, body.location]))
     return {
         "message": "Event created successfully"
     }
@@ -39,6 +62,8 @@ async def delete_event(id: int) -> dict:
     for event in events:
         if event.id == id:
             events.remove(event)
+            if search_index is not None:
+                search_index.remove(id)
             return {
                 "message": "Event deleted successfully"
             }
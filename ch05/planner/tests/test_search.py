@@ -0,0 +1,51 @@
+from database.search import InvertedIndex, tokenize
+
+
+def make_index() -> InvertedIndex:
+    index = InvertedIndex()
+    index.add(1, "FastAPI book launch on Google Meet")
+    index.add(2, "Python meetup: FastAPI, FastAPI and more FastAPI")
+    index.add(3, "Django workshop in Lagos")
+    return index
+
+
+def test_tokenize_lowercases_words() -> None:
+    assert tokenize("FastAPI, Book-Launch!") == ["fastapi", "book", "launch"]
+
+
+def test_search_ranks_by_term_frequency() -> None:
+    assert make_index().search("fastapi") == [2, 1]
+
+
+def test_search_weights_rare_terms() -> None:
+    assert make_index().search("fastapi lagos") == [2, 3, 1]
+
+
+def test_search_unknown_term() -> None:
+    assert make_index().search("flask") == []
+
+
+def test_remove_drops_document_and_empty_terms() -> None:
+    index = make_index()
+    index.remove(3)
+
+    assert index.search("django") == []
+    assert "django" not in index.postings
+    assert 3 not in index.documents
+
+
+def test_add_replaces_existing_document() -> None:
+    index = make_index()
+    index.add(1, "Rust conference")
+
+    assert index.search("fastapi") == [2]
+    assert index.search("rust") == [1]
+
+
+def test_search_paginates() -> None:
+    index = make_index()
+    ranked = index.search("fastapi meet lagos")
+
+    assert index.search("fastapi meet lagos", limit=1) == ranked[:1]
+    assert index.search("fastapi meet lagos", limit=2, skip=1) == ranked[1:3]
+    assert index.search("fastapi meet lagos", skip=10) == []
@@ -1,11 +1,63 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from database.connection import Settings
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
+from passlib.hash import bcrypt
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+settings = Settings()
+
+
+def benchmark_rounds(rounds: int) -> float:
+    start = time.perf_counter()
+    bcrypt.using(rounds=rounds).hash("calibration")
+    return time.perf_counter() - start
+
+
+def calibrate_rounds(target: float, min_rounds: int, max_rounds: int) -> int:
+    rounds = min_rounds
+    while rounds < max_rounds and benchmark_rounds(rounds + 1) <= target:
+        rounds += 1
+    return rounds
 
 
 class HashPassword:
-    def create_hash(self, password: str) -> str:
-        return pwd_context.hash(password)
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        workers = workers or settings.HASH_WORKERS
+        queue_size = settings.HASH_QUEUE_SIZE if queue_size is None else queue_size
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash_password")
+        self.capacity = workers + queue_size
+        self.pending = 0
+
+    async def run(self, func: Callable, *args: Any) -> Any:
+        if self.pending >= self.capacity:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password operations in progress, try again shortly.",
+                headers={"Retry-After": str(settings.HASH_RETRY_AFTER)}
+            )
+
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+
+    async def create_hash(self, password: str) -> str:
+        return await self.run(pwd_context.hash, password)
+
+    async def verify_hash(self, plain_password: str, hashed_password: str) -> bool:
+        return await self.run(pwd_context.verify, plain_password, hashed_password)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        return pwd_context.needs_update(hashed_password)
 
-    def verify_hash(self, plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password, hashed_password)
+    async def calibrate(self) -> int:
+        rounds = await self.run(calibrate_rounds, settings.HASH_TARGET_MS / 1000,
+                                settings.HASH_MIN_ROUNDS, settings.HASH_MAX_ROUNDS)
+        pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+        return rounds
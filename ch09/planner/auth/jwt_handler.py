@@ -1,12 +1,17 @@
 import time
 from datetime import datetime
 
+from auth.token_cache import TokenCache
 from database.connection import Settings
+from database.singleflight import SingleFlight
 from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from models.users import User
 
 settings = Settings()
+token_cache = TokenCache(User, settings.TOKEN_CACHE_MAX_ENTRIES,
+                         None if settings.CACHE_INVALIDATION else settings.CACHE_POLL_INTERVAL)
+user_lookups = SingleFlight()
 
 
 def create_access_token(user: str) -> str:
@@ -20,6 +25,10 @@ def create_access_token(user: str) -> str:
 
 
 async def verify_access_token(token: str) -> dict:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         data = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
 
@@ -35,13 +44,14 @@ async def verify_access_token(token: str) -> dict:
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Token expired!"
             )
-        user_exist = await User.find_one(User.email == data["user"])
+        user_exist = await user_lookups.do(data["user"], lambda: User.find_one(User.email == data["user"]))
         if not user_exist:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid token"
             )
 
+        token_cache.set(token, data, user_exist.id)
         return data
 
     except JWTError:
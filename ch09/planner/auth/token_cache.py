@@ -0,0 +1,51 @@
+import hashlib
+import sys
+import time
+from typing import Any, Optional
+
+from database.cache import LRUCache
+
+
+class TokenCache:
+    def __init__(self, model, max_entries: int, max_ttl: Optional[float] = None):
+        self.model = model
+        self.max_ttl = max_ttl
+        self.cache = LRUCache(max_entries, sys.maxsize, 0, sizeof=lambda entry: 1)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        entry = self.cache.get(self.digest(token))
+        if entry is None:
+            return None
+        return entry[0]
+
+    def set(self, token: str, data: dict, user_id: Any) -> None:
+        ttl = data["expires"] - time.time()
+        if self.max_ttl is not None:
+            ttl = min(ttl, self.max_ttl)
+        if ttl > 0:
+            self.cache.set(self.digest(token), (data, user_id), ttl=ttl)
+
+    def invalidate(self, *user_ids: Any) -> None:
+        for key in self.cache.keys():
+            entry = self.cache.peek(key)
+            if entry is not None and entry[1] in user_ids:
+                self.cache.pop(key)
+
+    def invalidate_all(self) -> None:
+        self.cache.clear()
+
+    async def revalidate(self) -> None:
+        entries = {key: self.cache.peek(key) for key in self.cache.keys()}
+        user_ids = list({entry[1] for entry in entries.values()})
+        if not user_ids:
+            return
+
+        cursor = self.model.get_motor_collection().find({"_id": {"$in": user_ids}}, {"email": 1})
+        emails = {doc["_id"]: doc["email"] async for doc in cursor}
+        for key, (data, user_id) in entries.items():
+            if emails.get(user_id) != data["user"]:
+                self.cache.pop(key)
@@ -0,0 +1,78 @@
+"""Compare request throughput with the stdlib and orjson encoders.
+
+GET /event/ renders its own pages; GET /event/tags returns a plain list and
+goes through FastJSONRoute, which skips FastAPI's jsonable_encoder pass.
+
+Needs a MongoDB at DATABASE_URL (defaults to a local "benchdb" database).
+It seeds its own events and removes them afterwards. Run it from
+ch09/planner with: python -m benchmarks.list_events
+"""
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "mongodb://localhost:27017/benchdb")
+os.environ.setdefault("LIST_CACHE_MAX_ENTRIES", "0")
+
+import httpx  # noqa: E402
+from database.connection import Settings  # noqa: E402
+from main import app  # noqa: E402
+from models.events import Event  # noqa: E402
+from routes import responses  # noqa: E402
+from routes.events import event_database  # noqa: E402
+
+CREATOR = "benchmark@packt.com"
+EVENTS = 1000
+PAGE_SIZE = 100
+REQUESTS = 200
+ENCODE_ROUNDS = 500
+
+
+def make_event(number: int) -> Event:
+    return Event(
+        creator=CREATOR,
+        title=f"FastAPI Book Launch {number}",
+        image="https://linktomyimage.com/image.png",
+        description="We will be discussing the contents of the FastAPI book in this event." * 4,
+        tags=["python", "fastapi", "book", "launch"],
+        location="Google Meet"
+    )
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, fast: bool) -> float:
+    responses.settings.FAST_JSON = fast
+    await client.get(url)
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        response = await client.get(url)
+        assert response.status_code == 200
+    return REQUESTS / (time.perf_counter() - start)
+
+
+def pages_per_second(events: list, fast: bool) -> float:
+    responses.settings.FAST_JSON = fast
+    start = time.perf_counter()
+    for _ in range(ENCODE_ROUNDS):
+        responses.encode(events)
+    return ENCODE_ROUNDS / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    await Settings().initialize_database()
+    await event_database.save_many([make_event(number) for number in range(EVENTS)], EVENTS)
+    events, _ = await event_database.get_page(PAGE_SIZE, query={"creator": CREATOR})
+
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://app") as client:
+            print(f"{'encoder':<10}{'GET /event/ req/s':>20}{'GET /event/tags req/s':>24}{'page encodes/s':>18}")
+            for name, fast in (("stdlib", False), ("orjson", True)):
+                pages = await requests_per_second(client, f"/event/?creator={CREATOR}&limit={PAGE_SIZE}", fast)
+                tags = await requests_per_second(client, "/event/tags", fast)
+                print(f"{name:<10}{pages:>20.1f}{tags:>24.1f}{pages_per_second(events, fast):>18.1f}")
+    finally:
+        await Event.find(Event.creator == CREATOR).delete()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,73 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class LRUCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float,
+                 sizeof: Callable[[Any], int] = sys.getsizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, size, expires_at = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self.pop(key)
+        size = self.sizeof(value)
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self.entries[key] = (value, size, expires_at)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, evicted_size, _) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.bytes = 0
+
+    def keys(self) -> list:
+        return list(self.entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -1,61 +1,288 @@
-from typing import Optional, Any, List
+import asyncio
+from typing import Optional, Any, AsyncIterator, Dict, List, Tuple, Type
 
 from beanie import init_beanie, PydanticObjectId
+from bson import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from database.cache import LRUCache
+from database.singleflight import SingleFlight
 from models.events import Event
 from models.users import User
 from motor.motor_asyncio import AsyncIOMotorClient
 from pydantic import BaseSettings, BaseModel
+from pymongo import DeleteMany, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
 
 
 class Settings(BaseSettings):
     DATABASE_URL: Optional[str] = None
     SECRET_KEY: Optional[str] = "default"
+    FAST_JSON: bool = True
+    VALIDATE_RESPONSES: bool = False
+    STREAM_BATCH_SIZE: int = 500
+    BATCH_MAX_IDS: int = 200
+    BULK_CHUNK_SIZE: int = 1000
+    EVENT_CACHE_MAX_ENTRIES: int = 10000
+    EVENT_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EVENT_CACHE_TTL: float = 60.0
+    LIST_CACHE_MAX_ENTRIES: int = 1000
+    LIST_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    LIST_CACHE_TTL: float = 5.0
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    CACHE_INVALIDATION: bool = False
+    CACHE_POLL_INTERVAL: float = 5.0
+    TAG_COUNTS_REFRESH_INTERVAL: float = 60.0
+    HASH_WORKERS: int = 4
+    HASH_QUEUE_SIZE: int = 64
+    HASH_RETRY_AFTER: int = 1
+    HASH_CALIBRATE: bool = False
+    HASH_TARGET_MS: float = 250.0
+    HASH_MIN_ROUNDS: int = 10
+    HASH_MAX_ROUNDS: int = 16
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_COMPRESSORS: Optional[str] = None
+    MONGO_SLOW_QUERY_MS: float = 100.0
+    METRICS_TOKEN: Optional[str] = None
+
+    def client_options(self) -> Dict[str, Any]:
+        options = {
+            "maxPoolSize": self.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": self.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": self.MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": self.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "compressors": self.MONGO_COMPRESSORS,
+        }
+        return {name: value for name, value in options.items() if value is not None}
 
-    async def initialize_database(self):
-        client = AsyncIOMotorClient(self.DATABASE_URL)
+    async def initialize_database(self, event_listeners: Optional[list] = None) -> AsyncIOMotorClient:
+        client = AsyncIOMotorClient(self.DATABASE_URL, event_listeners=event_listeners or [],
+                                    **self.client_options())
         await init_beanie(database=client.get_default_database(),
                           document_models=[Event, User])
+        await warm_pool(client, self.MONGO_MIN_POOL_SIZE)
+        return client
 
     class Config:
         env_file = ".env"
 
 
+async def warm_pool(client: AsyncIOMotorClient, size: int) -> None:
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(size)))
+
+
+def owner_query(id: Any, creator: Optional[str] = None) -> Dict[str, Any]:
+    query = {"_id": id}
+    if creator is not None:
+        query["creator"] = creator
+    return query
+
+
 class Database:
-    def __init__(self, model):
+    def __init__(self, model, cache: Optional[LRUCache] = None):
         self.model = model
+        self.cache = cache
+        self.flights = SingleFlight()
+        self.version = 0
+
+    def invalidate(self, *ids: Any) -> None:
+        self.version += 1
+        self.flights.discard(*ids)
+        if self.cache is None:
+            return
+        for id in ids:
+            self.cache.pop(id)
+
+    def invalidate_all(self) -> None:
+        self.version += 1
+        self.flights.clear()
+        if self.cache is not None:
+            self.cache.clear()
+
+    async def revalidate(self) -> None:
+        if self.cache is None:
+            return
+        ids = self.cache.keys()
+        if not ids:
+            return
+
+        cursor = self.model.get_motor_collection().find({"_id": {"$in": ids}})
+        current = {doc["_id"]: self.model.parse_obj(doc) async for doc in cursor}
+        for id in ids:
+            cached = self.cache.peek(id)
+            if id not in current or cached is None or cached.dict() != current[id].dict():
+                self.invalidate(id)
 
     async def save(self, document):
         await document.create()
+        self.invalidate(document.id)
         return
 
-    async def get(self, id: PydanticObjectId) -> bool:
-        doc = await self.model.get(id)
+    async def save_many(self, documents: List[Any], chunk_size: int) -> List[Dict[str, Any]]:
+        collection = self.model.get_motor_collection()
+        results = []
+        for start in range(0, len(documents), chunk_size):
+            chunk = documents[start:start + chunk_size]
+            raw_chunk = []
+            for document in chunk:
+                raw = document.dict(by_alias=True)
+                if raw["_id"] is None:
+                    del raw["_id"]
+                raw_chunk.append(raw)
+
+            try:
+                await collection.insert_many(raw_chunk, ordered=False)
+                errors = {}
+            except BulkWriteError as error:
+                errors = {e["index"]: e["errmsg"] for e in error.details["writeErrors"]}
+
+            for index, (document, raw) in enumerate(zip(chunk, raw_chunk)):
+                if index in errors:
+                    results.append({"id": None, "error": errors[index]})
+                else:
+                    document.id = raw["_id"]
+                    results.append({"id": document.id, "error": None})
+            self.invalidate(*(raw["_id"] for raw in raw_chunk))
+        return results
+
+    async def get(self, id: PydanticObjectId, projection: Optional[Type[BaseModel]] = None) -> bool:
+        if self.cache is not None:
+            doc = self.cache.get(id)
+            if doc is not None:
+                return doc if projection is None else projection.parse_obj(doc.dict(by_alias=True))
+
+        if projection is not None:
+            doc = await self.model.find_one({"_id": id}).project(projection)
+            return doc or False
+
+        doc = await self.flights.do(id, lambda: self.load(id))
         if doc:
             return doc
         return False
 
-    async def get_all(self) -> List[Any]:
-        docs = await self.model.find_all().to_list()
-        return docs
+    async def load(self, id: PydanticObjectId) -> Any:
+        version = self.version
+        doc = await self.model.get(id)
+        if doc and self.cache is not None and self.version == version:
+            self.cache.set(id, doc)
+        return doc
+
+    async def get_many(self, ids: List[PydanticObjectId]) -> List[Any]:
+        found = {}
+        if self.cache is not None:
+            for id in ids:
+                doc = self.cache.get(id)
+                if doc is not None:
+                    found[id] = doc
+
+        missing = [id for id in ids if id not in found]
+        if missing:
+            version = self.version
+            async for doc in self.model.find({"_id": {"$in": missing}}):
+                found[doc.id] = doc
+                if self.cache is not None and self.version == version:
+                    self.cache.set(doc.id, doc)
+        return [found.get(id) for id in ids]
+
+    async def get_page(self, limit: int, after: Optional[PydanticObjectId] = None,
+                       query: Optional[Dict[str, Any]] = None,
+                       projection: Optional[Type[BaseModel]] = None) -> Tuple[List[Any], Optional[PydanticObjectId]]:
+        query = dict(query or {})
+        if after is not None:
+            query["_id"] = {"$gt": after}
+        docs = await self.model.find(query).sort("_id").limit(limit + 1).project(projection).to_list()
+        if len(docs) > limit:
+            return docs[:limit], docs[limit - 1].id
+        return docs, None
+
+    async def stream(self, batch_size: int, query: Optional[Dict[str, Any]] = None,
+                     projection: Optional[Type[BaseModel]] = None) -> AsyncIterator[Any]:
+        async for doc in self.model.find(query or {}, batch_size=batch_size).sort("_id").project(projection):
+            yield doc
+
+    async def stream_raw(self, batch_size: int, query: Optional[Dict[str, Any]] = None,
+                         projection: Optional[Type[BaseModel]] = None) -> AsyncIterator[RawBSONDocument]:
+        fields = None if projection is None else {field.alias: 1 for field in projection.__fields__.values()}
+        collection = self.model.get_motor_collection().with_options(codec_options=RAW_CODEC_OPTIONS)
+        async for doc in collection.find(query or {}, fields, batch_size=batch_size).sort("_id"):
+            yield doc
+
+    async def search(self, text: str, limit: int, skip: int = 0) -> List[Any]:
+        score = {"score": {"$meta": "textScore"}}
+        cursor = self.model.get_motor_collection().find({"$text": {"$search": text}}, score)
+        cursor = cursor.sort([("score", {"$meta": "textScore"})]).skip(skip).limit(limit)
+        return [self.model.parse_obj(doc) async for doc in cursor]
 
-    async def update(self, id: PydanticObjectId, body: BaseModel) -> Any:
-        doc_id = id
+    async def count_values(self, field: str) -> List[Dict[str, Any]]:
+        pipeline = [
+            {"$unwind": f"${field}"},
+            {"$group": {"_id": f"${field}", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]
+        cursor = self.model.get_motor_collection().aggregate(pipeline)
+        return [{"value": doc["_id"], "count": doc["count"]} async for doc in cursor]
+
+    async def update(self, id: PydanticObjectId, body: BaseModel, creator: Optional[str] = None,
+                     expected: Optional[Dict[str, Any]] = None) -> Any:
         des_body = body.dict()
 
         des_body = {k: v for k, v in des_body.items() if v is not None}
-        update_query = {"$set": {
-            field: value for field, value in des_body.items()
-        }}
+        if creator is None:
+            update_query = {"$set": des_body}
+        else:
+            update_query = [{"$set": {
+                field: {"$cond": [{"$eq": ["$creator", creator]}, {"$literal": value}, f"${field}"]}
+                for field, value in des_body.items()
+            }}]
 
-        doc = await self.get(doc_id)
+        query = {**(expected or {}), "_id": id}
+        collection = self.model.get_motor_collection()
+        if des_body:
+            doc = await collection.find_one_and_update(query, update_query,
+                                                       return_document=ReturnDocument.AFTER)
+        else:
+            doc = await collection.find_one(query)
+        self.invalidate(id)
         if not doc:
             return False
-        await doc.update(update_query)
-        return doc
+        return self.model.parse_obj(doc)
 
-    async def delete(self, id: PydanticObjectId) -> bool:
-        doc = await self.get(id)
-        if not doc:
-            return False
-        await doc.delete()
-        return True
+    async def delete(self, id: PydanticObjectId, creator: Optional[str] = None,
+                     expected: Optional[Dict[str, Any]] = None) -> bool:
+        query = {**(expected or {}), **owner_query(id, creator)}
+        result = await self.model.get_motor_collection().delete_one(query)
+        self.invalidate(id)
+        return result.deleted_count == 1
+
+    async def update_many(self, updates: List[Tuple[PydanticObjectId, BaseModel]], chunk_size: int,
+                          creator: Optional[str] = None) -> Dict[str, int]:
+        requests = []
+        for id, body in updates:
+            des_body = body.dict(exclude={"id"})
+
+            des_body = {k: v for k, v in des_body.items() if v is not None}
+            if des_body:
+                requests.append(UpdateOne(owner_query(id, creator), {"$set": des_body}))
+
+        collection = self.model.get_motor_collection()
+        counts = {"matched": 0, "modified": 0}
+        for start in range(0, len(requests), chunk_size):
+            result = await collection.bulk_write(requests[start:start + chunk_size], ordered=False)
+            counts["matched"] += result.matched_count
+            counts["modified"] += result.modified_count
+        self.invalidate(*(id for id, _ in updates))
+        return counts
+
+    async def delete_many(self, ids: List[PydanticObjectId], chunk_size: int, creator: Optional[str] = None) -> int:
+        collection = self.model.get_motor_collection()
+        deleted = 0
+        for start in range(0, len(ids), chunk_size):
+            query = owner_query({"$in": ids[start:start + chunk_size]}, creator)
+            result = await collection.bulk_write([DeleteMany(query)], ordered=False)
+            deleted += result.deleted_count
+        self.invalidate(*ids)
+        return deleted
@@ -0,0 +1,65 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+logger = logging.getLogger(__name__)
+
+CHANGE_STREAMS_NOT_SUPPORTED = 40573
+RESUME_NOT_POSSIBLE = {280, 286}
+
+
+class CacheInvalidator:
+    def __init__(self, database: Any, targets: Dict[str, Any], poll_interval: float):
+        self.database = database
+        self.targets = targets
+        self.poll_interval = poll_interval
+        self.resume_token: Optional[Dict[str, Any]] = None
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.watch()
+            except PyMongoError as error:
+                if isinstance(error, OperationFailure) and error.code == CHANGE_STREAMS_NOT_SUPPORTED:
+                    logger.info("Change streams are not supported, polling every %ss", self.poll_interval)
+                    await self.poll()
+                logger.warning("Change stream interrupted: %s", error)
+                if isinstance(error, OperationFailure) and error.code in RESUME_NOT_POSSIBLE:
+                    self.resume_token = None
+                await asyncio.sleep(self.poll_interval)
+
+    async def watch(self) -> None:
+        pipeline = [{"$match": {"ns.coll": {"$in": list(self.targets)}}}]
+        async with self.database.watch(pipeline, resume_after=self.resume_token) as stream:
+            if self.resume_token is None:
+                self.invalidate_all()
+            try:
+                async for change in stream:
+                    self.handle(change)
+                    self.resume_token = stream.resume_token
+            finally:
+                self.resume_token = stream.resume_token or self.resume_token
+
+    async def poll(self) -> None:
+        while True:
+            try:
+                for target in self.targets.values():
+                    await target.revalidate()
+            except PyMongoError as error:
+                logger.warning("Cache revalidation failed: %s", error)
+                self.invalidate_all()
+            await asyncio.sleep(self.poll_interval)
+
+    def handle(self, change: Dict[str, Any]) -> None:
+        if "documentKey" in change:
+            target = self.targets.get(change.get("ns", {}).get("coll"))
+            if target is not None:
+                target.invalidate(change["documentKey"]["_id"])
+        else:
+            self.invalidate_all()
+
+    def invalidate_all(self) -> None:
+        for target in self.targets.values():
+            target.invalidate_all()
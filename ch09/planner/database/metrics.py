@@ -0,0 +1,214 @@
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+DEFAULT_MAX_POOL_SIZE = 100
+
+
+class Histogram:
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS_MS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        return {
+            "count": self.count,
+            "sum_ms": round(self.total, 3),
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+
+def filter_shape(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: filter_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        shapes = []
+        for item in value:
+            shape = filter_shape(item)
+            if shape not in shapes:
+                shapes.append(shape)
+        return shapes
+    return "?"
+
+
+def command_filter(command: Dict[str, Any]) -> Optional[Any]:
+    for key in ("filter", "query", "pipeline"):
+        if key in command:
+            return command[key]
+    for key in ("updates", "deletes"):
+        if command.get(key):
+            return command[key][0].get("q")
+    return None
+
+
+def command_collection(command: Dict[str, Any], command_name: str) -> str:
+    target = command.get(command_name)
+    if isinstance(target, str):
+        return target
+    return command.get("collection", "")
+
+
+class CommandMetrics(monitoring.CommandListener):
+    def __init__(self, slow_ms: float):
+        self.slow_ms = slow_ms
+        self.lock = threading.Lock()
+        self.pending: Dict[Tuple[Any, int], Tuple[str, str, Optional[Any]]] = {}
+        self.latencies: Dict[Tuple[str, str], Histogram] = defaultdict(Histogram)
+        self.failures: Counter = Counter()
+        self.slow = 0
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        command = event.command
+        collection = f"{event.database_name}.{command_collection(command, event.command_name)}"
+        with self.lock:
+            self.pending[(event.connection_id, event.request_id)] = (
+                collection, event.command_name, command_filter(command)
+            )
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self.finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self.finish(event, failed=True)
+
+    def finish(self, event: Any, failed: bool = False) -> None:
+        elapsed_ms = event.duration_micros / 1000
+        with self.lock:
+            started = self.pending.pop((event.connection_id, event.request_id), None)
+            if started is None:
+                return
+            collection, command_name, query = started
+            self.latencies[(collection, command_name)].observe(elapsed_ms)
+            if failed:
+                self.failures[(collection, command_name)] += 1
+            slow = elapsed_ms >= self.slow_ms
+            if slow:
+                self.slow += 1
+
+        if slow:
+            logger.warning("Slow %s on %s took %.1f ms, filter %s", command_name, collection, elapsed_ms,
+                           json.dumps(filter_shape(query), default=str))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            collections: Dict[str, Dict[str, Any]] = defaultdict(dict)
+            for (collection, command_name), histogram in sorted(self.latencies.items()):
+                collections[collection][command_name] = {
+                    **histogram.snapshot(),
+                    "failures": self.failures[(collection, command_name)],
+                }
+            return {
+                "slow_ms": self.slow_ms,
+                "slow": self.slow,
+                "collections": dict(collections),
+            }
+
+
+class PoolStats:
+    def __init__(self, max_size: int = DEFAULT_MAX_POOL_SIZE):
+        self.max_size = max_size
+        self.open = 0
+        self.in_use = 0
+        self.waiting = 0
+        self.peak_in_use = 0
+        self.wait = Histogram()
+        self.failures: Counter = Counter()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "max_size": self.max_size,
+            "open": self.open,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "peak_in_use": self.peak_in_use,
+            "saturation": round(self.in_use / self.max_size, 3) if self.max_size else 0.0,
+            "checkout_wait": self.wait.snapshot(),
+            "checkout_failures": dict(self.failures),
+        }
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pools: Dict[Tuple[str, int], PoolStats] = defaultdict(PoolStats)
+        self.checkouts: Dict[Tuple[Tuple[str, int], int], float] = {}
+
+    def pool_created(self, event: monitoring.PoolCreatedEvent) -> None:
+        with self.lock:
+            self.pools[event.address].max_size = event.options.get("maxPoolSize", DEFAULT_MAX_POOL_SIZE)
+
+    def pool_ready(self, event: Any) -> None:
+        pass
+
+    def pool_cleared(self, event: monitoring.PoolClearedEvent) -> None:
+        pass
+
+    def pool_closed(self, event: monitoring.PoolClosedEvent) -> None:
+        with self.lock:
+            self.pools.pop(event.address, None)
+
+    def connection_created(self, event: monitoring.ConnectionCreatedEvent) -> None:
+        with self.lock:
+            self.pools[event.address].open += 1
+
+    def connection_ready(self, event: monitoring.ConnectionReadyEvent) -> None:
+        pass
+
+    def connection_closed(self, event: monitoring.ConnectionClosedEvent) -> None:
+        with self.lock:
+            self.pools[event.address].open -= 1
+
+    def connection_check_out_started(self, event: monitoring.ConnectionCheckOutStartedEvent) -> None:
+        with self.lock:
+            self.checkouts[(event.address, threading.get_ident())] = time.perf_counter()
+            self.pools[event.address].waiting += 1
+
+    def connection_check_out_failed(self, event: monitoring.ConnectionCheckOutFailedEvent) -> None:
+        with self.lock:
+            pool = self.pools[event.address]
+            if self.checkouts.pop((event.address, threading.get_ident()), None) is not None:
+                pool.waiting -= 1
+            pool.failures[event.reason] += 1
+
+    def connection_checked_out(self, event: monitoring.ConnectionCheckedOutEvent) -> None:
+        now = time.perf_counter()
+        with self.lock:
+            pool = self.pools[event.address]
+            started = self.checkouts.pop((event.address, threading.get_ident()), None)
+            if started is not None:
+                pool.waiting -= 1
+                pool.wait.observe((now - started) * 1000)
+            pool.in_use += 1
+            pool.peak_in_use = max(pool.peak_in_use, pool.in_use)
+
+    def connection_checked_in(self, event: monitoring.ConnectionCheckedInEvent) -> None:
+        with self.lock:
+            self.pools[event.address].in_use -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {f"{host}:{port}": pool.snapshot() for (host, port), pool in sorted(self.pools.items())}
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from database.singleflight import SingleFlight
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+class RefreshingValue:
+    def __init__(self, loader: Callable[[], Awaitable[Any]], interval: float):
+        self.loader = loader
+        self.interval = interval
+        self.value: Optional[Any] = None
+        self.loaded_at = 0.0
+        self.flights = SingleFlight()
+
+    async def get(self) -> Any:
+        if self.value is None or time.monotonic() - self.loaded_at > self.interval:
+            await self.flights.do("refresh", self.refresh)
+        return self.value
+
+    async def refresh(self) -> None:
+        self.value = await self.loader()
+        self.loaded_at = time.monotonic()
+
+    async def run(self) -> None:
+        while True:
+            try:
+                await self.flights.do("refresh", self.refresh)
+            except PyMongoError as error:
+                logger.warning("Refreshing cached value failed: %s", error)
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,26 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    def __init__(self):
+        self.calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = self.calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self.calls[key] = future
+            future.add_done_callback(lambda done: self.forget(key, done))
+        return await asyncio.shield(future)
+
+    def forget(self, key: Hashable, future: asyncio.Future) -> None:
+        if self.calls.get(key) is future:
+            del self.calls[key]
+
+    def discard(self, *keys: Hashable) -> None:
+        for key in keys:
+            self.calls.pop(key, None)
+
+    def clear(self) -> None:
+        self.calls.clear()
@@ -1,17 +1,25 @@
+import asyncio
+
+from auth.jwt_handler import token_cache
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
 from database.connection import Settings
+from database.invalidation import CacheInvalidator
+from models.events import Event
 
-from routes.users import user_router
-from routes.events import event_router
+from routes.users import user_router, hash_password
+from routes.events import event_router, event_database, tag_counts
+from routes.metrics import metrics_router, command_metrics, pool_metrics
+from routes.responses import FastJSONResponse
 
 import uvicorn
 
-app = FastAPI()
-
 settings = Settings()
 
+app = FastAPI(default_response_class=FastJSONResponse if settings.FAST_JSON else JSONResponse)
+background_tasks = []
+
 
 # register origins
 
@@ -30,11 +38,35 @@ app.add_middleware(
 
 app.include_router(user_router,  prefix="/user")
 app.include_router(event_router, prefix="/event")
+app.include_router(metrics_router, prefix="/metrics")
 
 
 @app.on_event("startup")
 async def init_db():
-    await settings.initialize_database()
+    app.state.mongo_client = await settings.initialize_database(event_listeners=[command_metrics, pool_metrics])
+
+    if settings.HASH_CALIBRATE:
+        await hash_password.calibrate()
+
+    background_tasks.append(asyncio.create_task(tag_counts.run()))
+
+    if settings.CACHE_INVALIDATION:
+        invalidator = CacheInvalidator(
+            Event.get_motor_collection().database,
+            {"events": event_database, "users": token_cache},
+            settings.CACHE_POLL_INTERVAL
+        )
+        background_tasks.append(asyncio.create_task(invalidator.run()))
+
+
+@app.on_event("shutdown")
+async def stop_background_tasks():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+
+    app.state.mongo_client.close()
 
 
 @app.get("/")
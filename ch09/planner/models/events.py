@@ -1,7 +1,11 @@
-from typing import Optional, List
+from enum import Enum
+from functools import lru_cache
+from typing import Optional, List, Tuple, Type
 
-from beanie import Document
-from pydantic import BaseModel
+from beanie import Document, PydanticObjectId
+from bson import ObjectId
+from pydantic import BaseModel, Field, create_model
+from pymongo import ASCENDING, TEXT, IndexModel
 
 
 class Event(Document):
@@ -25,6 +29,34 @@ class Event(Document):
 
     class Settings:
         name = "events"
+        indexes = [
+            IndexModel([("creator", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("tags", ASCENDING)]),
+            IndexModel(
+                [("title", TEXT), ("description", TEXT), ("location", TEXT)],
+                weights={"title": 10, "location": 2, "description": 1},
+                name="event_text"
+            ),
+        ]
+
+
+PROJECTABLE_FIELDS = set(Event.__fields__) - {"id", "revision_id"}
+
+
+class EventProjectionConfig:
+    allow_population_by_field_name = True
+    json_encoders = {ObjectId: str}
+
+
+@lru_cache(maxsize=64)
+def event_projection(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    definitions = {name: (Optional[Event.__fields__[name].outer_type_], None) for name in fields}
+    return create_model(
+        "EventProjection",
+        __config__=EventProjectionConfig,
+        id=(Optional[PydanticObjectId], Field(None, alias="_id")),
+        **definitions
+    )
 
 
 class EventUpdate(BaseModel):
@@ -44,3 +76,22 @@ class EventUpdate(BaseModel):
                 "location": "Google Meet"
             }
         }
+
+
+class EventBatch(BaseModel):
+    events: List[Event]
+    missing: List[str]
+
+
+class EventBulkUpdate(EventUpdate):
+    id: PydanticObjectId
+
+
+class StreamFormat(str, Enum):
+    ndjson = "ndjson"
+    json = "json"
+
+
+class TagMatch(str, Enum):
+    any = "any"
+    all = "all"
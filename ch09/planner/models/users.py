@@ -1,6 +1,7 @@
 from beanie import Document
 
 from pydantic import BaseModel, EmailStr
+from pymongo import ASCENDING, IndexModel
 
 
 class User(Document):
@@ -9,6 +10,9 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel([("email", ASCENDING)], unique=True),
+        ]
 
     class Config:
         schema_extra = {
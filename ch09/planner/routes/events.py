@@ -1,33 +1,244 @@
-from typing import List
+import hashlib
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Type
 
 from auth.authenticate import authenticate
 from beanie import PydanticObjectId
-from database.connection import Database
-from fastapi import APIRouter, Depends, HTTPException, status
-from models.events import Event, EventUpdate
+from database.cache import LRUCache
+from database.connection import Database, Settings
+from database.refresh import RefreshingValue
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from models.events import (Event, EventBatch, EventBulkUpdate, EventUpdate, PROJECTABLE_FIELDS, StreamFormat, TagMatch,
+                           event_projection)
+from pydantic import BaseModel
+from routes.responses import FastJSONRoute, encode, encode_raw, encode_trusted
 
 event_router = APIRouter(
-    tags=["Events"]
+    tags=["Events"],
+    route_class=FastJSONRoute
 )
 
-event_database = Database(Event)
+settings = Settings()
+event_database = Database(Event, cache=LRUCache(
+    settings.EVENT_CACHE_MAX_ENTRIES,
+    settings.EVENT_CACHE_MAX_BYTES,
+    settings.EVENT_CACHE_TTL,
+    sizeof=lambda event: len(encode(event))
+))
+list_cache = LRUCache(
+    settings.LIST_CACHE_MAX_ENTRIES,
+    settings.LIST_CACHE_MAX_BYTES,
+    settings.LIST_CACHE_TTL,
+    sizeof=lambda page: len(page[0])
+)
+tag_counts = RefreshingValue(lambda: event_database.count_values("tags"), settings.TAG_COUNTS_REFRESH_INTERVAL)
+
+STREAM_MEDIA_TYPES = {
+    StreamFormat.ndjson: "application/x-ndjson",
+    StreamFormat.json: "application/json",
+}
+
+
+def encode_batch(batch: List[bytes], stream: StreamFormat, first: bool) -> bytes:
+    if stream == StreamFormat.ndjson:
+        return b"".join(line + b"\n" for line in batch)
+    return (b"" if first else b",") + b",".join(batch)
+
+
+async def encode_events(events: AsyncIterator[Any], stream: StreamFormat, batch_size: int,
+                        encoder: Callable[[Any], bytes]) -> AsyncIterator[bytes]:
+    if stream == StreamFormat.json:
+        yield b"["
+
+    batch = []
+    first = True
+    async for event in events:
+        batch.append(encoder(event))
+        if len(batch) == batch_size:
+            yield encode_batch(batch, stream, first)
+            batch = []
+            first = False
+    if batch:
+        yield encode_batch(batch, stream, first)
+
+    if stream == StreamFormat.json:
+        yield b"]"
+
+
+def event_query(creator: Optional[str], tags: Optional[str], match: TagMatch) -> dict:
+    query = {}
+    if creator is not None:
+        query["creator"] = creator
+    tag_list = [tag.strip() for tag in (tags or "").split(",") if tag.strip()]
+    if tag_list:
+        operator = "$all" if match == TagMatch.all else "$in"
+        query["tags"] = {operator: tag_list}
+    return query
+
+
+def compute_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = True) -> bool:
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or (weak and f"W/{etag}" in tags)
+
+
+def render_event(event: BaseModel) -> Response:
+    body = encode_trusted(event, type(event))
+    return Response(body, media_type="application/json", headers={"ETag": compute_etag(body)})
+
+
+def not_modified(response: Response, if_none_match: Optional[str]) -> Response:
+    etag = response.headers["ETag"]
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return response
+
+
+async def check_if_match(id: PydanticObjectId, if_match: Optional[str]) -> Optional[dict]:
+    if if_match is None:
+        return None
+
+    current = await event_database.load(id)
+    if not current:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Event with supplied ID does not exist"
+        )
+    if not etag_matches(if_match, render_event(current).headers["ETag"], weak=False):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Event has been modified"
+        )
+    return current.dict(exclude={"id"})
+
+
+def event_fields(fields: Optional[str] = None) -> Optional[Type[BaseModel]]:
+    if not fields:
+        return None
+    names = tuple(sorted({name.strip() for name in fields.split(",") if name.strip()}))
+    unknown = set(names) - PROJECTABLE_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    return event_projection(names)
+
+
+async def render_page(limit: int, after: Optional[PydanticObjectId], query: dict,
+                      projection: Optional[Type[BaseModel]] = None) -> Tuple[bytes, dict]:
+    events, next_cursor = await event_database.get_page(limit, after, query, projection)
+    body = encode_trusted(events, List[projection or Event])
+    headers = {"ETag": compute_etag(body)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    return body, headers
+
+
+async def page_events(limit: int, after: Optional[PydanticObjectId], query: dict,
+                      projection: Optional[Type[BaseModel]] = None) -> Response:
+    body, headers = await render_page(limit, after, query, projection)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @event_router.get("/", response_model=List[Event])
-async def retrieve_all_events() -> List[Event]:
-    events = await event_database.get_all()
-    return events
+async def retrieve_all_events(request: Request,
+                              limit: int = Query(100, ge=1, le=1000),
+                              after: Optional[PydanticObjectId] = None,
+                              creator: Optional[str] = None,
+                              tags: Optional[str] = None,
+                              match: TagMatch = TagMatch.any,
+                              stream: Optional[StreamFormat] = None,
+                              projection: Optional[Type[BaseModel]] = Depends(event_fields),
+                              if_none_match: Optional[str] = Header(None)) -> List[Event]:
+    query = event_query(creator, tags, match)
+    if stream:
+        batch_size = settings.STREAM_BATCH_SIZE
+        model = projection or Event
+        return StreamingResponse(
+            encode_events(event_database.stream(batch_size, query, projection), stream, batch_size,
+                          encoder=lambda event: encode_trusted(event, model)),
+            media_type=STREAM_MEDIA_TYPES[stream]
+        )
+
+    key = (event_database.version, tuple(sorted(request.query_params.multi_items())))
+    page = list_cache.get(key)
+    if page is None:
+        page = await render_page(limit, after, query, projection)
+        list_cache.set(key, page)
+    body, headers = page
+    return not_modified(Response(body, media_type="application/json", headers=headers), if_none_match)
+
+
+@event_router.get("/export")
+async def export_events(creator: Optional[str] = None,
+                        tags: Optional[str] = None,
+                        match: TagMatch = TagMatch.any,
+                        stream: StreamFormat = StreamFormat.ndjson,
+                        projection: Optional[Type[BaseModel]] = Depends(event_fields)) -> StreamingResponse:
+    batch_size = settings.STREAM_BATCH_SIZE
+    query = event_query(creator, tags, match)
+    return StreamingResponse(
+        encode_events(event_database.stream_raw(batch_size, query, projection), stream, batch_size,
+                      encoder=encode_raw),
+        media_type=STREAM_MEDIA_TYPES[stream]
+    )
+
+
+@event_router.get("/mine", response_model=List[Event])
+async def retrieve_my_events(limit: int = Query(100, ge=1, le=1000),
+                             after: Optional[PydanticObjectId] = None,
+                             user: str = Depends(authenticate)) -> List[Event]:
+    return await page_events(limit, after, {"creator": user})
+
+
+@event_router.get("/batch", response_model=EventBatch)
+async def retrieve_events_batch(ids: str = Query(..., min_length=1)) -> dict:
+    requested = list(dict.fromkeys(id.strip() for id in ids.split(",") if id.strip()))
+    if len(requested) > settings.BATCH_MAX_IDS or not all(PydanticObjectId.is_valid(id) for id in requested):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Supply up to {settings.BATCH_MAX_IDS} valid event IDs"
+        )
+
+    events = await event_database.get_many([PydanticObjectId(id) for id in requested])
+    batch = {
+        "events": [event for event in events if event],
+        "missing": [id for id, event in zip(requested, events) if not event]
+    }
+    return Response(encode_trusted(batch, EventBatch), media_type="application/json")
+
+
+@event_router.get("/search", response_model=List[Event])
+async def search_events(q: str = Query(..., min_length=1),
+                        limit: int = Query(20, ge=1, le=100),
+                        skip: int = Query(0, ge=0, le=1000)) -> List[Event]:
+    events = await event_database.search(q, limit, skip)
+    return Response(encode_trusted(events, List[Event]), media_type="application/json")
+
+
+@event_router.get("/tags")
+async def retrieve_tag_counts() -> List[dict]:
+    counts = await tag_counts.get()
+    return [{"tag": count["value"], "count": count["count"]} for count in counts]
 
 
 @event_router.get("/{id}", response_model=Event)
-async def retrieve_event(id: PydanticObjectId) -> Event:
-    event = await event_database.get(id)
+async def retrieve_event(id: PydanticObjectId,
+                         projection: Optional[Type[BaseModel]] = Depends(event_fields),
+                         if_none_match: Optional[str] = Header(None)) -> Event:
+    event = await event_database.get(id, projection)
     if not event:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event with supplied ID does not exist"
         )
-    return event
+    return not_modified(render_event(event), if_none_match)
 
 
 @event_router.post("/new")
@@ -39,37 +250,83 @@ async def create_event(body: Event, user: str = Depends(authenticate)) -> dict:
     }
 
 
+@event_router.post("/bulk")
+async def create_events(body: List[Event], user: str = Depends(authenticate)) -> dict:
+    for event in body:
+        event.creator = user
+    results = await event_database.save_many(body, settings.BULK_CHUNK_SIZE)
+    return {
+        "message": "Events processed successfully",
+        "results": [
+            {"id": str(result["id"]) if result["id"] else None, "error": result["error"]}
+            for result in results
+        ]
+    }
+
+
+@event_router.patch("/bulk")
+async def update_events(body: List[EventBulkUpdate], user: str = Depends(authenticate)) -> dict:
+    counts = await event_database.update_many([(item.id, item) for item in body],
+                                              settings.BULK_CHUNK_SIZE, creator=user)
+    return {
+        "message": "Events updated successfully",
+        **counts
+    }
+
+
+@event_router.delete("/bulk")
+async def delete_events(ids: List[PydanticObjectId] = Body(...), user: str = Depends(authenticate)) -> dict:
+    deleted = await event_database.delete_many(ids, settings.BULK_CHUNK_SIZE, creator=user)
+    return {
+        "message": "Events deleted successfully.",
+        "deleted": deleted
+    }
+
+
 @event_router.put("/{id}", response_model=Event)
-async def update_event(id: PydanticObjectId, body: EventUpdate, user: str = Depends(authenticate)) -> Event:
-    event = await event_database.get(id)
-    if event.creator != user:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Operation not allowed"
-        )
-    updated_event = await event_database.update(id, body)
+async def update_event(id: PydanticObjectId, body: EventUpdate, user: str = Depends(authenticate),
+                       if_match: Optional[str] = Header(None)) -> Event:
+    expected = await check_if_match(id, if_match)
+    updated_event = await event_database.update(id, body, creator=user, expected=expected)
     if not updated_event:
+        if expected is not None:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Event has been modified"
+            )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Event with supplied ID does not exist"
         )
-    return updated_event
-
-
-@event_router.delete("/{id}")
-async def delete_event(id: PydanticObjectId, user: str = Depends(authenticate)) -> dict:
-    event = await event_database.get(id)
-    if event.creator != user:
+    if updated_event.creator != user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Operation not allowed"
         )
-    if not event:
+    return render_event(updated_event)
+
+
+@event_router.delete("/{id}")
+async def delete_event(id: PydanticObjectId, user: str = Depends(authenticate),
+                       if_match: Optional[str] = Header(None)) -> dict:
+    expected = await check_if_match(id, if_match)
+    deleted = await event_database.delete(id, creator=user, expected=expected)
+    if not deleted:
+        event = await event_database.load(id)
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event with supplied ID does not exist"
+            )
+        if event.creator != user:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Operation not allowed"
+            )
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Event with supplied ID does not exist"
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Event has been modified"
         )
-    await event_database.delete(id)
 
     return {
         "message": "Event deleted successfully."
@@ -0,0 +1,41 @@
+import hmac
+from typing import Optional
+
+from auth.jwt_handler import token_cache
+from database.connection import Settings
+from database.metrics import CommandMetrics, PoolMetrics
+from fastapi import APIRouter, Header, HTTPException, status
+from routes.events import event_database, list_cache
+from routes.responses import FastJSONRoute
+
+metrics_router = APIRouter(
+    tags=["Metrics"],
+    route_class=FastJSONRoute
+)
+
+settings = Settings()
+command_metrics = CommandMetrics(settings.MONGO_SLOW_QUERY_MS)
+pool_metrics = PoolMetrics()
+
+
+@metrics_router.get("/")
+async def retrieve_metrics(x_metrics_token: Optional[str] = Header(None)) -> dict:
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Metrics are not enabled"
+        )
+    if x_metrics_token is None or not hmac.compare_digest(x_metrics_token, settings.METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid metrics token"
+        )
+    return {
+        "commands": command_metrics.snapshot(),
+        "pools": pool_metrics.snapshot(),
+        "caches": {
+            "events": event_database.cache.stats(),
+            "event_lists": list_cache.stats(),
+            "tokens": token_cache.cache.stats(),
+        },
+    }
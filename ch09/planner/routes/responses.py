@@ -0,0 +1,65 @@
+import asyncio
+import functools
+from typing import Any, Callable
+
+import bson
+import orjson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from database.connection import Settings
+from fastapi.encoders import jsonable_encoder
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, parse_obj_as
+
+settings = Settings()
+
+
+def default(obj: Any) -> Any:
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if isinstance(obj, BaseModel):
+        return obj.dict(by_alias=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def encode(content: Any) -> bytes:
+    if settings.FAST_JSON:
+        return orjson.dumps(content, default=default)
+    return JSONResponse(jsonable_encoder(content, by_alias=True)).body
+
+
+def encode_trusted(content: Any, model: Any) -> bytes:
+    if settings.VALIDATE_RESPONSES:
+        content = parse_obj_as(model, content)
+    return encode(content)
+
+
+def encode_raw(document: RawBSONDocument) -> bytes:
+    return orjson.dumps(bson.decode(document.raw), default=default)
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=default)
+
+
+def pre_encoded(endpoint: Callable, model: Any = None, status_code: int = 200) -> Callable:
+    @functools.wraps(endpoint)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        content = await endpoint(*args, **kwargs)
+        if isinstance(content, Response) or not settings.FAST_JSON:
+            return content
+        body = encode(content) if model is None else encode_trusted(content, model)
+        return Response(body, status_code=status_code, media_type="application/json")
+
+    wrapper.pre_encoded = True
+    return wrapper
+
+
+class FastJSONRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs: Any) -> None:
+        if asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "pre_encoded", False):
+            endpoint = pre_encoded(endpoint, kwargs.get("response_model"), kwargs.get("status_code") or 200)
+        super().__init__(path, endpoint, **kwargs)
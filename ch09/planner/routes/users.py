@@ -1,44 +1,56 @@
 from auth.hash_password import HashPassword
 from auth.jwt_handler import create_access_token
 from database.connection import Database
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from models.users import User, TokenResponse
+from pymongo.errors import DuplicateKeyError
+from routes.responses import FastJSONRoute
 
 user_router = APIRouter(
     tags=["User"],
+    route_class=FastJSONRoute
 )
 
 user_database = Database(User)
 hash_password = HashPassword()
 
 
+async def rehash_password(user: User, password: str) -> None:
+    try:
+        hashed_password = await hash_password.create_hash(password)
+    except HTTPException:
+        return
+    await user.set({User.password: hashed_password})
+
+
 @user_router.post("/signup")
 async def sign_user_up(user: User) -> dict:
-    user_exist = await User.find_one(User.email == user.email)
-
-    if user_exist:
+    hashed_password = await hash_password.create_hash(user.password)
+    user.password = hashed_password
+    try:
+        await user_database.save(user)
+    except DuplicateKeyError:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="User with email provided exists already."
         )
-    hashed_password = hash_password.create_hash(user.password)
-    user.password = hashed_password
-    await user_database.save(user)
     return {
         "message": "User created successfully"
     }
 
 
 @user_router.post("/signin", response_model=TokenResponse)
-async def sign_user_in(user: OAuth2PasswordRequestForm = Depends()) -> dict:
+async def sign_user_in(background_tasks: BackgroundTasks, user: OAuth2PasswordRequestForm = Depends()) -> dict:
     user_exist = await User.find_one(User.email == user.username)
     if not user_exist:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User with email does not exist."
         )
-    if hash_password.verify_hash(user.password, user_exist.password):
+    if await hash_password.verify_hash(user.password, user_exist.password):
+        if hash_password.needs_update(user_exist.password):
+            background_tasks.add_task(rehash_password, user_exist, user.password)
         access_token = create_access_token(user_exist.email)
         return {
             "access_token": access_token,
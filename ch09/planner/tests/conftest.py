@@ -6,6 +6,7 @@ from database.connection import Settings
 from main import app
 from models.events import Event
 from models.users import User
+from routes import responses
 
 
 @pytest.fixture(scope="session")
@@ -21,6 +22,8 @@ async def init_db():
 
     await test_settings.initialize_database()
 
+    responses.settings.VALIDATE_RESPONSES = True
+
 
 @pytest.fixture(scope="session")
 async def default_client():
@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from auth.jwt_handler import create_access_token
+from models.events import Event
+from models.users import User
+from routes import events as event_routes
+
+
+@pytest.fixture(scope="module")
+async def bulk_headers() -> dict:
+    user = User(email="importer@packt.com", password="hashed")
+    await User.insert_one(user)
+
+    yield {"Authorization": f"Bearer {create_access_token(user.email)}"}
+
+    await Event.find_all().delete()
+    await user.delete()
+
+
+def event_payload(number: int) -> dict:
+    return {
+        "title": f"Imported Event {number}",
+        "image": "https://linktomyimage.com/image.png",
+        "description": "An event created through the bulk import endpoint.",
+        "tags": ["python", "import"],
+        "location": "Google Meet"
+    }
+
+
+@pytest.mark.asyncio
+async def test_create_events_bulk(default_client: httpx.AsyncClient, bulk_headers: dict, monkeypatch) -> None:
+    monkeypatch.setattr(event_routes.settings, "BULK_CHUNK_SIZE", 2)
+    payload = [event_payload(number) for number in range(5)]
+
+    response = await default_client.post("/event/bulk", json=payload, headers=bulk_headers)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert len(results) == 5
+    assert all(result["error"] is None for result in results)
+
+    events = await Event.find(Event.creator == "importer@packt.com").to_list()
+    assert sorted(str(event.id) for event in events) == sorted(result["id"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_create_events_bulk_reports_failures(default_client: httpx.AsyncClient, bulk_headers: dict) -> None:
+    existing = await Event.find_one(Event.creator == "importer@packt.com")
+    payload = [event_payload(5), dict(event_payload(6), _id=str(existing.id)), event_payload(7)]
+
+    response = await default_client.post("/event/bulk", json=payload, headers=bulk_headers)
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert results[0]["error"] is None and results[2]["error"] is None
+    assert results[1]["id"] is None and results[1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_update_events_bulk(default_client: httpx.AsyncClient, bulk_headers: dict) -> None:
+    events = await Event.find(Event.creator == "importer@packt.com").to_list()
+    foreign = Event(creator="someone@packt.com", **event_payload(99))
+    await Event.insert_one(foreign)
+    payload = [{"id": str(event.id), "location": "Packt HQ"} for event in events + [foreign]]
+
+    response = await default_client.patch("/event/bulk", json=payload, headers=bulk_headers)
+
+    assert response.status_code == 200
+    assert response.json()["matched"] == len(events)
+    assert (await Event.get(events[0].id)).location == "Packt HQ"
+    assert (await Event.get(foreign.id)).location == "Google Meet"
+
+
+@pytest.mark.asyncio
+async def test_delete_events_bulk(default_client: httpx.AsyncClient, bulk_headers: dict) -> None:
+    events = await Event.find(Event.creator == "importer@packt.com").to_list()
+    foreign = await Event.find_one(Event.creator == "someone@packt.com")
+    payload = [str(event.id) for event in events + [foreign]]
+
+    response = await default_client.request("DELETE", "/event/bulk", json=payload, headers=bulk_headers)
+
+    assert response.status_code == 200
+    assert response.json()["deleted"] == len(events)
+    assert await Event.find(Event.creator == "importer@packt.com").count() == 0
+    assert await Event.get(foreign.id)
@@ -0,0 +1,133 @@
+import asyncio
+
+import httpx
+import pytest
+
+from database import cache as cache_module
+from database.cache import LRUCache
+from database.connection import Database
+from models.events import Event, EventUpdate
+
+
+@pytest.fixture
+def clock(monkeypatch) -> list:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cache_hit_and_miss() -> None:
+    cache = LRUCache(max_entries=2, max_bytes=1024, ttl=60, sizeof=len)
+    cache.set("a", "event-a")
+
+    assert cache.get("a") == "event-a"
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = LRUCache(max_entries=2, max_bytes=1024, ttl=60, sizeof=len)
+    cache.set("a", "event-a")
+    cache.set("b", "event-b")
+    cache.get("a")
+    cache.set("c", "event-c")
+
+    assert cache.keys() == ["a", "c"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_respects_byte_limit() -> None:
+    cache = LRUCache(max_entries=10, max_bytes=10, ttl=60, sizeof=len)
+    cache.set("a", "12345")
+    cache.set("b", "123456")
+    cache.set("c", "x" * 11)
+
+    assert cache.keys() == ["b"]
+    assert cache.stats()["bytes"] == 6
+
+
+def test_cache_expires_entries(clock: list) -> None:
+    cache = LRUCache(max_entries=10, max_bytes=1024, ttl=5, sizeof=len)
+    cache.set("a", "event-a")
+    cache.set("b", "event-b", ttl=20)
+    clock[0] += 10
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "event-b"
+    assert cache.keys() == ["b"]
+
+
+def test_cache_pop() -> None:
+    cache = LRUCache(max_entries=10, max_bytes=1024, ttl=60, sizeof=len)
+    cache.set("a", "event-a")
+    cache.pop("a")
+    cache.pop("missing")
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 0
+
+
+@pytest.fixture
+async def cached_database(default_client: httpx.AsyncClient):
+    event = Event(
+        creator="cache@packt.com",
+        title="Cached Event",
+        image="https://linktomyimage.com/image.png",
+        description="An event read while it is being updated.",
+        tags=["python"],
+        location="Google Meet"
+    )
+    await Event.insert_one(event)
+
+    yield Database(Event, cache=LRUCache(max_entries=10, max_bytes=1024 * 1024, ttl=60)), event
+
+    await event.delete()
+
+
+@pytest.mark.asyncio
+async def test_load_racing_update_does_not_cache_stale_event(cached_database, monkeypatch) -> None:
+    database, event = cached_database
+    read, release = asyncio.Event(), asyncio.Event()
+    original_get = Event.get
+
+    async def gated_get(id):
+        doc = await original_get(id)
+        read.set()
+        await release.wait()
+        return doc
+
+    monkeypatch.setattr(Event, "get", gated_get)
+    load = asyncio.ensure_future(database.get(event.id))
+    await read.wait()
+    await database.update(event.id, EventUpdate(title="Cached Event Renamed"))
+    release.set()
+    await load
+    monkeypatch.setattr(Event, "get", original_get)
+
+    assert database.cache.peek(event.id) is None
+    assert (await database.get(event.id)).title == "Cached Event Renamed"
+
+
+@pytest.mark.asyncio
+async def test_get_after_update_does_not_join_stale_load(cached_database, monkeypatch) -> None:
+    database, event = cached_database
+    read, release = asyncio.Event(), asyncio.Event()
+    original_get = Event.get
+
+    async def gated_get(id):
+        doc = await original_get(id)
+        if not read.is_set():
+            read.set()
+            await release.wait()
+        return doc
+
+    monkeypatch.setattr(Event, "get", gated_get)
+    load = asyncio.ensure_future(database.get(event.id))
+    await read.wait()
+    await database.update(event.id, EventUpdate(title="Cached Event Renamed"))
+    fresh = await asyncio.wait_for(database.get(event.id), timeout=1)
+    release.set()
+    await load
+
+    assert fresh.title == "Cached Event Renamed"
@@ -0,0 +1,45 @@
+from database.connection import Settings, warm_pool
+
+
+class FakeAdmin:
+    def __init__(self):
+        self.commands = []
+
+    async def command(self, command: str) -> dict:
+        self.commands.append(command)
+        return {"ok": 1.0}
+
+
+class FakeClient:
+    def __init__(self):
+        self.admin = FakeAdmin()
+
+
+def test_client_options_defaults() -> None:
+    assert Settings().client_options() == {"maxPoolSize": 100, "minPoolSize": 0}
+
+
+def test_client_options_pool_settings() -> None:
+    settings = Settings(
+        MONGO_MAX_POOL_SIZE=50,
+        MONGO_MIN_POOL_SIZE=10,
+        MONGO_MAX_IDLE_TIME_MS=60000,
+        MONGO_WAIT_QUEUE_TIMEOUT_MS=2000,
+        MONGO_COMPRESSORS="zstd,zlib"
+    )
+
+    assert settings.client_options() == {
+        "maxPoolSize": 50,
+        "minPoolSize": 10,
+        "maxIdleTimeMS": 60000,
+        "waitQueueTimeoutMS": 2000,
+        "compressors": "zstd,zlib",
+    }
+
+
+async def test_warm_pool_pings_min_pool_size() -> None:
+    client = FakeClient()
+
+    await warm_pool(client, 3)
+
+    assert client.admin.commands == ["ping", "ping", "ping"]
@@ -0,0 +1,150 @@
+import httpx
+import pytest
+
+from auth.jwt_handler import create_access_token
+from models.events import Event
+from models.users import User
+
+
+@pytest.fixture(scope="module")
+async def etag_event() -> Event:
+    user = User(email="poller@packt.com", password="hashed")
+    await User.insert_one(user)
+    event = Event(
+        creator=user.email,
+        title="Polled Event",
+        image="https://linktomyimage.com/image.png",
+        description="An event that clients poll for changes.",
+        tags=["python"],
+        location="Google Meet"
+    )
+    await Event.insert_one(event)
+
+    intruder = User(email="etag-intruder@packt.com", password="hashed")
+    await User.insert_one(intruder)
+
+    yield event
+
+    await Event.find_all().delete()
+    await user.delete()
+    await intruder.delete()
+
+
+@pytest.fixture(scope="module")
+async def intruder_headers() -> dict:
+    return {"Authorization": f"Bearer {create_access_token('etag-intruder@packt.com')}"}
+
+
+@pytest.fixture(scope="module")
+async def poller_headers() -> dict:
+    return {"Authorization": f"Bearer {create_access_token('poller@packt.com')}"}
+
+
+@pytest.mark.asyncio
+async def test_get_event_not_modified(default_client: httpx.AsyncClient, etag_event: Event) -> None:
+    url = f"/event/{etag_event.id}"
+    response = await default_client.get(url)
+    etag = response.headers["ETag"]
+
+    response = await default_client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_get_events_not_modified(default_client: httpx.AsyncClient, etag_event: Event) -> None:
+    url = "/event/?creator=poller@packt.com"
+    response = await default_client.get(url)
+
+    response = await default_client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_update_event_with_stale_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                            poller_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    headers = {**poller_headers, "If-Match": '"stale"'}
+
+    response = await default_client.put(url, json={"title": "Lost Update"}, headers=headers)
+
+    assert response.status_code == 412
+    assert (await Event.get(etag_event.id)).title == etag_event.title
+
+
+@pytest.mark.asyncio
+async def test_get_event_not_modified_weak_etag(default_client: httpx.AsyncClient, etag_event: Event) -> None:
+    url = f"/event/{etag_event.id}"
+    etag = (await default_client.get(url)).headers["ETag"]
+
+    response = await default_client.get(url, headers={"If-None-Match": f"W/{etag}"})
+
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_update_event_with_weak_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                           poller_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    etag = (await default_client.get(url)).headers["ETag"]
+    headers = {**poller_headers, "If-Match": f"W/{etag}"}
+
+    response = await default_client.put(url, json={"title": "Weak Update"}, headers=headers)
+
+    assert response.status_code == 412
+    assert (await Event.get(etag_event.id)).title != "Weak Update"
+
+
+@pytest.mark.asyncio
+async def test_update_event_with_current_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                              poller_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    etag = (await default_client.get(url)).headers["ETag"]
+    headers = {**poller_headers, "If-Match": etag}
+
+    response = await default_client.put(url, json={"title": "Safe Update"}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["title"] == "Safe Update"
+    assert response.headers["ETag"] != etag
+    assert (await default_client.get(url)).headers["ETag"] == response.headers["ETag"]
+
+
+@pytest.mark.asyncio
+async def test_delete_event_with_stale_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                            poller_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    headers = {**poller_headers, "If-Match": '"stale"'}
+
+    response = await default_client.delete(url, headers=headers)
+
+    assert response.status_code == 412
+    assert await Event.get(etag_event.id)
+
+
+@pytest.mark.asyncio
+async def test_delete_event_not_owner_with_current_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                                        intruder_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    etag = (await default_client.get(url)).headers["ETag"]
+
+    response = await default_client.delete(url, headers={**intruder_headers, "If-Match": etag})
+
+    assert response.status_code == 400
+    assert await Event.get(etag_event.id)
+
+
+@pytest.mark.asyncio
+async def test_update_event_not_owner_with_current_etag(default_client: httpx.AsyncClient, etag_event: Event,
+                                                        intruder_headers: dict) -> None:
+    url = f"/event/{etag_event.id}"
+    before = await Event.get(etag_event.id)
+    etag = (await default_client.get(url)).headers["ETag"]
+
+    response = await default_client.put(url, json={"title": "Hijacked"}, headers={**intruder_headers, "If-Match": etag})
+
+    assert response.status_code == 400
+    assert await Event.get(etag_event.id) == before
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+
+from auth import hash_password as hash_password_module
+from auth.hash_password import HashPassword
+from models.users import User
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify() -> None:
+    hash_password = HashPassword(workers=1, queue_size=0)
+
+    hashed = await hash_password.create_hash("strong!!!")
+
+    assert await hash_password.verify_hash("strong!!!", hashed)
+    assert not await hash_password.verify_hash("weak", hashed)
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_is_full() -> None:
+    hash_password = HashPassword(workers=1, queue_size=1)
+    running = [asyncio.ensure_future(hash_password.run(time.sleep, 0.2)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as error:
+        await hash_password.run(time.sleep, 0)
+
+    assert error.value.status_code == 503
+    assert "Retry-After" in error.value.headers
+    await asyncio.gather(*running)
+    assert await hash_password.run(len, "free again") == 10
+
+
+def test_calibrate_rounds_stays_under_budget(monkeypatch) -> None:
+    monkeypatch.setattr(hash_password_module, "benchmark_rounds", lambda rounds: 0.01 * 2 ** (rounds - 8))
+
+    assert hash_password_module.calibrate_rounds(0.25, 8, 16) == 12
+    assert hash_password_module.calibrate_rounds(0.25, 8, 10) == 10
+    assert hash_password_module.calibrate_rounds(0.001, 8, 16) == 8
+
+
+@pytest.mark.asyncio
+async def test_calibrate_only_outdates_cheaper_hashes(monkeypatch) -> None:
+    monkeypatch.setattr(hash_password_module, "pwd_context", hash_password_module.pwd_context.copy())
+    monkeypatch.setattr(hash_password_module, "calibrate_rounds", lambda target, min_rounds, max_rounds: 5)
+    hash_password = HashPassword(workers=1, queue_size=0)
+
+    assert await hash_password.calibrate() == 5
+    assert hash_password.needs_update(bcrypt.using(rounds=4).hash("testpassword"))
+    assert not hash_password.needs_update(bcrypt.using(rounds=5).hash("testpassword"))
+    assert not hash_password.needs_update(bcrypt.using(rounds=6).hash("testpassword"))
+
+
+@pytest.mark.asyncio
+async def test_sign_in_rehashes_outdated_hash(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    user = User(email="rehash@packt.com", password=bcrypt.using(rounds=4).hash("testpassword"))
+    await User.insert_one(user)
+    calibrated = hash_password_module.pwd_context.copy(bcrypt__default_rounds=5, bcrypt__min_rounds=5)
+    monkeypatch.setattr(hash_password_module, "pwd_context", calibrated)
+
+    response = await default_client.post("/user/signin", data={"username": user.email, "password": "testpassword"})
+
+    assert response.status_code == 200
+    assert (await User.get(user.id)).password.startswith("$2b$05$")
+
+    await user.delete()
@@ -0,0 +1,165 @@
+import asyncio
+
+import httpx
+import pytest
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from database.invalidation import CacheInvalidator, CHANGE_STREAMS_NOT_SUPPORTED
+from models.events import Event
+from routes.events import event_database
+
+
+class RecordingTarget:
+    def __init__(self):
+        self.invalidated = []
+        self.cleared = 0
+        self.revalidated = 0
+
+    def invalidate(self, *ids) -> None:
+        self.invalidated += ids
+
+    def invalidate_all(self) -> None:
+        self.cleared += 1
+
+    async def revalidate(self) -> None:
+        self.revalidated += 1
+
+
+class StandaloneDatabase:
+    def watch(self, pipeline, resume_after=None):
+        raise OperationFailure("not a replica set", code=CHANGE_STREAMS_NOT_SUPPORTED)
+
+
+class FlakyStream:
+    def __init__(self, changes, error):
+        self.changes = list(changes)
+        self.error = error
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.changes:
+            change = self.changes.pop(0)
+            self.resume_token = change["_id"]
+            return change
+        if self.error:
+            raise self.error
+        await asyncio.sleep(3600)
+
+
+class FlakyDatabase:
+    def __init__(self, streams):
+        self.streams = list(streams)
+        self.resumed_from = []
+
+    def watch(self, pipeline, resume_after=None):
+        self.resumed_from.append(resume_after)
+        return self.streams.pop(0)
+
+
+async def run_until(invalidator: CacheInvalidator, done) -> None:
+    task = asyncio.create_task(invalidator.run())
+    for _ in range(100):
+        if done():
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+
+
+def change(token: str, id: str) -> dict:
+    return {"_id": {"_data": token}, "operationType": "update", "ns": {"coll": "events"}, "documentKey": {"_id": id}}
+
+
+def test_change_evicts_document() -> None:
+    events, users = RecordingTarget(), RecordingTarget()
+    invalidator = CacheInvalidator(None, {"events": events, "users": users}, 1)
+
+    invalidator.handle({"operationType": "update", "ns": {"coll": "events"}, "documentKey": {"_id": "abc"}})
+
+    assert events.invalidated == ["abc"]
+    assert users.invalidated == []
+
+
+def test_drop_clears_every_cache() -> None:
+    events, users = RecordingTarget(), RecordingTarget()
+    invalidator = CacheInvalidator(None, {"events": events, "users": users}, 1)
+
+    invalidator.handle({"operationType": "invalidate"})
+
+    assert events.cleared == 1
+    assert users.cleared == 1
+
+
+@pytest.mark.asyncio
+async def test_polling_fallback_on_standalone() -> None:
+    events = RecordingTarget()
+    invalidator = CacheInvalidator(StandaloneDatabase(), {"events": events}, 0.01)
+
+    task = asyncio.create_task(invalidator.run())
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert events.revalidated > 1
+
+
+@pytest.mark.asyncio
+async def test_dropped_stream_resumes_after_last_change() -> None:
+    events = RecordingTarget()
+    database = FlakyDatabase([
+        FlakyStream([change("1", "abc")], AutoReconnect("connection reset")),
+        FlakyStream([change("2", "def")], None),
+    ])
+    invalidator = CacheInvalidator(database, {"events": events}, 0.01)
+
+    await run_until(invalidator, lambda: len(events.invalidated) == 2)
+
+    assert database.resumed_from == [None, {"_data": "1"}]
+    assert events.invalidated == ["abc", "def"]
+    assert events.cleared == 1
+
+
+@pytest.mark.asyncio
+async def test_lost_history_clears_after_reopening() -> None:
+    events = RecordingTarget()
+    database = FlakyDatabase([
+        FlakyStream([change("1", "abc")], OperationFailure("history lost", code=286)),
+        FlakyStream([], None),
+    ])
+    invalidator = CacheInvalidator(database, {"events": events}, 0.01)
+
+    await run_until(invalidator, lambda: not database.streams)
+    await asyncio.sleep(0)
+
+    assert database.resumed_from == [None, None]
+    assert events.cleared == 2
+
+
+@pytest.mark.asyncio
+async def test_revalidate_evicts_stale_events(default_client: httpx.AsyncClient) -> None:
+    event = Event(
+        creator="poller@packt.com",
+        title="Polled Event",
+        image="https://linktomyimage.com/image.png",
+        description="An event changed behind the cache's back.",
+        tags=["python"],
+        location="Google Meet"
+    )
+    await Event.insert_one(event)
+    url = f"/event/{event.id}"
+    await default_client.get(url)
+
+    await Event.find_one(Event.id == event.id).update({"$set": {"title": "Changed Elsewhere"}})
+    await event_database.revalidate()
+    response = await default_client.get(url)
+
+    assert response.json()["title"] == "Changed Elsewhere"
+
+    await event.delete()
@@ -24,6 +24,23 @@ async def test_sign_new_user(default_client: httpx.AsyncClient) -> None:
     assert response.json() == test_response
 
 
+@pytest.mark.asyncio
+async def test_sign_existing_user(default_client: httpx.AsyncClient) -> None:
+    payload = {
+        "email": "testuser@packt.com",
+        "password": "anotherpassword",
+    }
+
+    headers = {
+        "accept": "application/json",
+        "Content-Type": "application/json"
+    }
+
+    response = await default_client.post("/user/signup", json=payload, headers=headers)
+
+    assert response.status_code == 409
+
+
 @pytest.mark.asyncio
 async def test_sign_user_in(default_client: httpx.AsyncClient) -> None:
     payload = {
@@ -0,0 +1,119 @@
+import datetime
+import logging
+
+import httpx
+import pytest
+from bson import ObjectId
+from pymongo import monitoring
+
+from database.metrics import CommandMetrics, Histogram, PoolMetrics, filter_shape
+from routes import metrics as metrics_routes
+
+ADDRESS = ("localhost", 27017)
+CONNECTION = ADDRESS
+
+
+def run_command(metrics: CommandMetrics, command: dict, request_id: int, elapsed_ms: float,
+                failed: bool = False) -> None:
+    name = next(iter(command))
+    metrics.started(monitoring.CommandStartedEvent(command, "planner", request_id, CONNECTION, request_id))
+    duration = datetime.timedelta(milliseconds=elapsed_ms)
+    if failed:
+        metrics.failed(monitoring.CommandFailedEvent(duration, {"ok": 0}, name, request_id, CONNECTION, request_id))
+    else:
+        metrics.succeeded(monitoring.CommandSucceededEvent(duration, {"ok": 1}, name, request_id, CONNECTION,
+                                                           request_id))
+
+
+def test_histogram_cumulative_buckets() -> None:
+    histogram = Histogram((1, 10))
+    for value in (0.5, 3, 7, 50):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "10": 3, "+Inf": 4}
+    assert snapshot["count"] == 4
+    assert snapshot["max_ms"] == 50
+
+
+def test_filter_shape_hides_values() -> None:
+    query = {"creator": "fastapi@packt.com", "_id": {"$in": [ObjectId(), ObjectId()]}, "tags": {"$all": ["a", "b"]}}
+
+    assert filter_shape(query) == {"creator": "?", "_id": {"$in": ["?"]}, "tags": {"$all": ["?"]}}
+
+
+def test_command_latency_by_collection_and_operation() -> None:
+    metrics = CommandMetrics(slow_ms=1000)
+    run_command(metrics, {"find": "Event", "filter": {}}, 1, 3)
+    run_command(metrics, {"find": "Event", "filter": {}}, 2, 30)
+    run_command(metrics, {"insert": "User", "documents": []}, 3, 2, failed=True)
+
+    collections = metrics.snapshot()["collections"]
+    assert collections["planner.Event"]["find"]["count"] == 2
+    assert collections["planner.Event"]["find"]["failures"] == 0
+    assert collections["planner.User"]["insert"]["failures"] == 1
+
+
+def test_slow_command_logs_filter_shape(caplog) -> None:
+    metrics = CommandMetrics(slow_ms=10)
+
+    with caplog.at_level(logging.WARNING, logger="database.metrics"):
+        run_command(metrics, {"find": "Event", "filter": {"creator": "secret@packt.com"}}, 1, 5)
+        run_command(metrics, {"find": "Event", "filter": {"creator": "secret@packt.com"}}, 2, 50)
+
+    assert metrics.snapshot()["slow"] == 1
+    assert len(caplog.records) == 1
+    assert '{"creator": "?"}' in caplog.text
+    assert "secret" not in caplog.text
+
+
+def test_pool_checkout_wait_and_saturation() -> None:
+    metrics = PoolMetrics()
+    metrics.pool_created(monitoring.PoolCreatedEvent(ADDRESS, {"maxPoolSize": 4}))
+    metrics.connection_created(monitoring.ConnectionCreatedEvent(ADDRESS, 1))
+    metrics.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+
+    assert metrics.snapshot()["localhost:27017"]["waiting"] == 1
+
+    metrics.connection_checked_out(monitoring.ConnectionCheckedOutEvent(ADDRESS, 1))
+    pool = metrics.snapshot()["localhost:27017"]
+    assert pool["waiting"] == 0
+    assert pool["in_use"] == 1
+    assert pool["saturation"] == 0.25
+    assert pool["checkout_wait"]["count"] == 1
+
+    metrics.connection_checked_in(monitoring.ConnectionCheckedInEvent(ADDRESS, 1))
+    metrics.connection_check_out_started(monitoring.ConnectionCheckOutStartedEvent(ADDRESS))
+    metrics.connection_check_out_failed(monitoring.ConnectionCheckOutFailedEvent(ADDRESS, "timeout"))
+    pool = metrics.snapshot()["localhost:27017"]
+    assert pool["in_use"] == 0
+    assert pool["peak_in_use"] == 1
+    assert pool["checkout_failures"] == {"timeout": 1}
+
+
+@pytest.mark.asyncio
+async def test_metrics_disabled_without_token(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(metrics_routes.settings, "METRICS_TOKEN", None)
+
+    response = await default_client.get("/metrics/", headers={"X-Metrics-Token": "anything"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_metrics_rejects_wrong_token(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(metrics_routes.settings, "METRICS_TOKEN", "scrape-secret")
+
+    assert (await default_client.get("/metrics/")).status_code == 403
+    assert (await default_client.get("/metrics/", headers={"X-Metrics-Token": "guess"})).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    monkeypatch.setattr(metrics_routes.settings, "METRICS_TOKEN", "scrape-secret")
+
+    response = await default_client.get("/metrics/", headers={"X-Metrics-Token": "scrape-secret"})
+
+    assert response.status_code == 200
+    assert set(response.json()) == {"commands", "pools", "caches"}
+    assert set(response.json()["caches"]) == {"events", "event_lists", "tokens"}
@@ -0,0 +1,120 @@
+import httpx
+import pytest
+from beanie import PydanticObjectId
+
+from auth.jwt_handler import create_access_token
+from models.events import Event
+from models.users import User
+
+
+@pytest.fixture(scope="module")
+async def owned_event() -> Event:
+    owner = User(email="owner@packt.com", password="hashed")
+    intruder = User(email="intruder@packt.com", password="hashed")
+    await User.insert_one(owner)
+    await User.insert_one(intruder)
+
+    event = Event(
+        creator=owner.email,
+        title="Owner Only Event",
+        image="https://linktomyimage.com/image.png",
+        description="Only the creator of this event may change it.",
+        tags=["python"],
+        location="Google Meet"
+    )
+    await Event.insert_one(event)
+
+    yield event
+
+    await Event.find_all().delete()
+    await owner.delete()
+    await intruder.delete()
+
+
+@pytest.fixture(scope="module")
+async def owner_headers() -> dict:
+    return {"Authorization": f"Bearer {create_access_token('owner@packt.com')}"}
+
+
+@pytest.fixture(scope="module")
+async def intruder_headers() -> dict:
+    return {"Authorization": f"Bearer {create_access_token('intruder@packt.com')}"}
+
+
+@pytest.mark.asyncio
+async def test_update_event_not_owner(default_client: httpx.AsyncClient, owned_event: Event, intruder_headers: dict) -> None:
+    url = f"/event/{owned_event.id}"
+
+    response = await default_client.put(url, json={"title": "Hijacked"}, headers=intruder_headers)
+
+    assert response.status_code == 400
+    assert (await Event.get(owned_event.id)).title == owned_event.title
+
+
+@pytest.mark.asyncio
+async def test_update_event_not_found(default_client: httpx.AsyncClient, owner_headers: dict) -> None:
+    url = f"/event/{PydanticObjectId()}"
+
+    response = await default_client.put(url, json={"title": "Missing"}, headers=owner_headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_event_owner(default_client: httpx.AsyncClient, owned_event: Event, owner_headers: dict) -> None:
+    url = f"/event/{owned_event.id}"
+
+    response = await default_client.put(url, json={"location": "Packt HQ"}, headers=owner_headers)
+
+    assert response.status_code == 200
+    assert response.json()["location"] == "Packt HQ"
+    assert response.json()["title"] == owned_event.title
+
+
+@pytest.mark.asyncio
+async def test_delete_event_not_owner(default_client: httpx.AsyncClient, owned_event: Event, intruder_headers: dict) -> None:
+    url = f"/event/{owned_event.id}"
+
+    response = await default_client.delete(url, headers=intruder_headers)
+
+    assert response.status_code == 400
+    assert await Event.get(owned_event.id)
+
+
+@pytest.mark.asyncio
+async def test_delete_event_not_found(default_client: httpx.AsyncClient, owner_headers: dict) -> None:
+    url = f"/event/{PydanticObjectId()}"
+
+    response = await default_client.delete(url, headers=owner_headers)
+
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_event_owner(default_client: httpx.AsyncClient, owned_event: Event, owner_headers: dict) -> None:
+    url = f"/event/{owned_event.id}"
+
+    response = await default_client.delete(url, headers=owner_headers)
+
+    assert response.status_code == 200
+    assert await Event.get(owned_event.id) is None
+
+
+@pytest.mark.asyncio
+async def test_update_event_invalidates_cache(default_client: httpx.AsyncClient, owner_headers: dict) -> None:
+    event = Event(
+        creator="owner@packt.com",
+        title="Cached Event",
+        image="https://linktomyimage.com/image.png",
+        description="An event that is read, updated and read again.",
+        tags=["python"],
+        location="Google Meet"
+    )
+    await Event.insert_one(event)
+    url = f"/event/{event.id}"
+
+    await default_client.get(url)
+    await default_client.put(url, json={"title": "Cached Event Renamed"}, headers=owner_headers)
+    response = await default_client.get(url)
+
+    assert response.json()["title"] == "Cached Event Renamed"
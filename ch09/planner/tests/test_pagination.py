@@ -0,0 +1,218 @@
+import json
+
+import httpx
+import pytest
+from beanie import PydanticObjectId
+
+from auth.jwt_handler import create_access_token
+from models.events import Event
+from models.users import User
+
+
+@pytest.fixture(scope="module")
+async def mock_events() -> list:
+    events = [
+        Event(
+            creator="pager@packt.com",
+            title=f"FastAPI Meetup {number}",
+            image="https://linktomyimage.com/image.png",
+            description="A recurring meetup used to exercise event pagination.",
+            tags=["python", "fastapi"],
+            location="Google Meet"
+        )
+        for number in range(5)
+    ]
+    for event in events:
+        await Event.insert_one(event)
+
+    yield events
+
+    await Event.find_all().delete()
+
+
+@pytest.mark.asyncio
+async def test_get_events_first_page(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/?limit=2")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in mock_events[:2]]
+    assert response.headers["X-Next-Cursor"] == str(mock_events[1].id)
+
+
+@pytest.mark.asyncio
+async def test_get_events_follow_cursor(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    seen = []
+    url = "/event/?limit=2"
+
+    while url:
+        response = await default_client.get(url)
+        assert response.status_code == 200
+        seen += [event["_id"] for event in response.json()]
+
+        cursor = response.headers.get("X-Next-Cursor")
+        url = f"/event/?limit=2&after={cursor}" if cursor else None
+
+    assert seen == [str(event.id) for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_get_events_limit_bounds(default_client: httpx.AsyncClient) -> None:
+    response = await default_client.get("/event/?limit=0")
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_stream_events_ndjson(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/?stream=ndjson")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["_id"] for event in lines] == [str(event.id) for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_stream_events_json_array(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/?stream=json")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_export_events_matches_stream(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    streamed = await default_client.get("/event/?stream=ndjson")
+    exported = await default_client.get("/event/export")
+
+    assert exported.status_code == 200
+    assert exported.headers["content-type"].startswith("application/x-ndjson")
+    assert exported.text == streamed.text
+
+
+@pytest.mark.asyncio
+async def test_export_events_json_array(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/export?stream=json&creator=pager@packt.com")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_get_events_by_creator(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    other = Event(creator="someone@packt.com", title="Someone Else's Event", image="https://linktomyimage.com/image.png",
+                  description="Not created by the pager.", tags=["python"], location="Google Meet")
+    await Event.insert_one(other)
+
+    response = await default_client.get("/event/?creator=pager@packt.com&limit=3")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in mock_events[:3]]
+    assert response.headers["X-Next-Cursor"] == str(mock_events[2].id)
+
+    await other.delete()
+
+
+@pytest.mark.asyncio
+async def test_get_my_events(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    user = User(email="pager@packt.com", password="hashed")
+    await User.insert_one(user)
+    headers = {"Authorization": f"Bearer {create_access_token(user.email)}"}
+
+    response = await default_client.get("/event/mine", headers=headers)
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in mock_events]
+
+    await user.delete()
+
+
+@pytest.mark.asyncio
+async def test_get_my_events_requires_sign_in(default_client: httpx.AsyncClient) -> None:
+    response = await default_client.get("/event/mine")
+
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_events_with_fields(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/?fields=title,tags&limit=2")
+
+    assert response.status_code == 200
+    assert response.json()[0] == {"_id": str(mock_events[0].id), "title": mock_events[0].title, "tags": mock_events[0].tags}
+    assert response.headers["X-Next-Cursor"] == str(mock_events[1].id)
+
+
+@pytest.mark.asyncio
+async def test_stream_events_with_fields(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/?stream=ndjson&fields=title")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"_id": str(event.id), "title": event.title} for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_export_events_with_fields(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    response = await default_client.get("/event/export?fields=title")
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == [{"_id": str(event.id), "title": event.title} for event in mock_events]
+
+
+@pytest.mark.asyncio
+async def test_get_event_with_fields(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    url = f"/event/{mock_events[0].id}?fields=image"
+
+    for _ in range(2):
+        response = await default_client.get(url)
+
+        assert response.status_code == 200
+        assert response.json() == {"_id": str(mock_events[0].id), "image": mock_events[0].image}
+        await default_client.get(f"/event/{mock_events[0].id}")
+
+
+@pytest.mark.asyncio
+async def test_get_events_with_unknown_field(default_client: httpx.AsyncClient) -> None:
+    response = await default_client.get("/event/?fields=title,password")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_events_batch(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    missing = str(PydanticObjectId())
+    await default_client.get(f"/event/{mock_events[3].id}")
+    ids = [str(mock_events[3].id), missing, str(mock_events[0].id)]
+
+    response = await default_client.get(f"/event/batch?ids={','.join(ids)}")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()["events"]] == [ids[0], ids[2]]
+    assert response.json()["missing"] == [missing]
+
+
+@pytest.mark.asyncio
+async def test_get_events_batch_invalid_id(default_client: httpx.AsyncClient) -> None:
+    response = await default_client.get("/event/batch?ids=not-an-id")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_events_cached_until_write(default_client: httpx.AsyncClient, mock_events: list) -> None:
+    user = User(email="pager@packt.com", password="hashed")
+    await User.insert_one(user)
+    headers = {"Authorization": f"Bearer {create_access_token(user.email)}"}
+    url = "/event/?creator=pager@packt.com&fields=title"
+
+    first = await default_client.get(url)
+    await Event.find_one(Event.id == mock_events[0].id).update({"$set": {"title": "Changed Directly"}})
+    cached = await default_client.get(url)
+    await default_client.put(f"/event/{mock_events[0].id}", json={"title": "Changed Through API"}, headers=headers)
+    fresh = await default_client.get(url)
+
+    assert cached.content == first.content
+    assert fresh.json()[0]["title"] == "Changed Through API"
+
+    await user.delete()
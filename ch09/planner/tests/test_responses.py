@@ -0,0 +1,78 @@
+from typing import List
+
+import httpx
+import orjson
+import pytest
+from beanie import PydanticObjectId
+from fastapi import routing as fastapi_routing
+from models.events import Event
+from models.users import User
+from pydantic import ValidationError
+from routes import responses
+from routes.responses import encode_trusted
+
+
+@pytest.fixture
+def validate(monkeypatch) -> None:
+    monkeypatch.setattr(responses.settings, "VALIDATE_RESPONSES", True)
+
+
+@pytest.fixture
+def trusted(monkeypatch) -> None:
+    monkeypatch.setattr(responses.settings, "VALIDATE_RESPONSES", False)
+
+
+def make_event() -> Event:
+    return Event(
+        id=PydanticObjectId(),
+        creator="fastapi@packt.com",
+        title="FastAPI BookLaunch",
+        image="https://linktomyimage.com/image.png",
+        description="We will be discussing the contents of the FastAPI book in this event.",
+        tags=["python", "fastapi"],
+        location="Google Meet"
+    )
+
+
+def test_trusted_encoding_skips_validation(trusted) -> None:
+    body = encode_trusted([{"title": 1}], List[Event])
+
+    assert orjson.loads(body) == [{"title": 1}]
+
+
+def test_validated_encoding_rejects_bad_documents(validate) -> None:
+    with pytest.raises(ValidationError):
+        encode_trusted([{"title": 1}], List[Event])
+
+
+@pytest.mark.asyncio
+async def test_validated_encoding_matches_trusted(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    events = [make_event(), make_event()]
+
+    monkeypatch.setattr(responses.settings, "VALIDATE_RESPONSES", True)
+    validated = encode_trusted(events, List[Event])
+    monkeypatch.setattr(responses.settings, "VALIDATE_RESPONSES", False)
+    trusted = encode_trusted(events, List[Event])
+
+    assert validated == trusted
+    assert orjson.loads(trusted)[0]["_id"] == str(events[0].id)
+
+
+@pytest.mark.asyncio
+async def test_plain_routes_skip_jsonable_encoder(default_client: httpx.AsyncClient, monkeypatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("jsonable_encoder should not run")
+
+    monkeypatch.setattr(fastapi_routing, "jsonable_encoder", fail)
+    signup = await default_client.post("/user/signup", json={"email": "encoder@packt.com", "password": "testpassword"})
+    signin = await default_client.post("/user/signin",
+                                       data={"username": "encoder@packt.com", "password": "testpassword"})
+    headers = {"Authorization": f"Bearer {signin.json()['access_token']}"}
+    deleted = await default_client.request("DELETE", "/event/bulk", json=[], headers=headers)
+
+    assert signup.status_code == 200
+    assert signin.status_code == 200
+    assert set(signin.json()) == {"access_token", "token_type"}
+    assert deleted.status_code == 200
+
+    await User.find_one(User.email == "encoder@packt.com").delete()
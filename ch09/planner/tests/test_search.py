@@ -0,0 +1,46 @@
+import httpx
+import pytest
+
+from models.events import Event
+
+
+@pytest.fixture(scope="module")
+async def searchable_events() -> list:
+    events = [
+        Event(creator="searcher@packt.com", title="MongoDB Internals", image="https://linktomyimage.com/image.png",
+              description="Storage engines and indexes.", tags=[], location="Berlin"),
+        Event(creator="searcher@packt.com", title="Cooking Class", image="https://linktomyimage.com/image.png",
+              description="Nothing about databases, except a mongodb joke.", tags=[], location="Paris"),
+        Event(creator="searcher@packt.com", title="Gardening", image="https://linktomyimage.com/image.png",
+              description="Plants.", tags=[], location="Rome"),
+    ]
+    for event in events:
+        await Event.insert_one(event)
+
+    yield events
+
+    for event in events:
+        await event.delete()
+
+
+@pytest.mark.asyncio
+async def test_search_events_by_relevance(default_client: httpx.AsyncClient, searchable_events: list) -> None:
+    response = await default_client.get("/event/search?q=mongodb")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(searchable_events[0].id), str(searchable_events[1].id)]
+
+
+@pytest.mark.asyncio
+async def test_search_events_paginates(default_client: httpx.AsyncClient, searchable_events: list) -> None:
+    response = await default_client.get("/event/search?q=mongodb&limit=1&skip=1")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(searchable_events[1].id)]
+
+
+@pytest.mark.asyncio
+async def test_search_events_requires_query(default_client: httpx.AsyncClient) -> None:
+    response = await default_client.get("/event/search")
+
+    assert response.status_code == 422
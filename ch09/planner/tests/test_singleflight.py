@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from database.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_flight() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def load() -> str:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "event"
+
+    results = await asyncio.gather(*(flights.do("id", load) for _ in range(10)))
+
+    assert results == ["event"] * 10
+    assert len(calls) == 1
+    assert flights.calls == {}
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_every_caller() -> None:
+    flights = SingleFlight()
+
+    async def load() -> str:
+        await asyncio.sleep(0.01)
+        raise ValueError("database unavailable")
+
+    results = await asyncio.gather(flights.do("id", load), flights.do("id", load), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others() -> None:
+    flights = SingleFlight()
+
+    async def load() -> str:
+        await asyncio.sleep(0.01)
+        return "event"
+
+    first = asyncio.ensure_future(flights.do("id", load))
+    second = asyncio.ensure_future(flights.do("id", load))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "event"
+
+
+@pytest.mark.asyncio
+async def test_new_flight_after_completion() -> None:
+    flights = SingleFlight()
+    calls = []
+
+    async def load() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert await flights.do("id", load) == 1
+    await asyncio.sleep(0)
+    assert await flights.do("id", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_discarded_flight_is_not_joined() -> None:
+    flights = SingleFlight()
+    release = asyncio.Event()
+    values = iter(["old", "new"])
+
+    async def load() -> str:
+        value = next(values)
+        if value == "old":
+            await release.wait()
+        return value
+
+    first = asyncio.ensure_future(flights.do("id", load))
+    await asyncio.sleep(0)
+    flights.discard("id")
+    second = await flights.do("id", load)
+    release.set()
+
+    assert second == "new"
+    assert await first == "old"
+    assert flights.calls == {}
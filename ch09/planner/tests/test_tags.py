@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+
+from database.refresh import RefreshingValue
+from models.events import Event
+
+
+@pytest.fixture(scope="module")
+async def tagged_events() -> list:
+    await Event.find_all().delete()
+    events = [
+        Event(
+            creator="tagger@packt.com",
+            title=f"Tagged Event {number}",
+            image="https://linktomyimage.com/image.png",
+            description="An event used to exercise tag queries.",
+            tags=tags,
+            location="Google Meet"
+        )
+        for number, tags in enumerate([["python", "fastapi"], ["python"], ["mongodb"]])
+    ]
+    for event in events:
+        await Event.insert_one(event)
+
+    yield events
+
+    await Event.find_all().delete()
+
+
+@pytest.mark.asyncio
+async def test_get_events_with_any_tag(default_client: httpx.AsyncClient, tagged_events: list) -> None:
+    response = await default_client.get("/event/?tags=fastapi,mongodb")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(tagged_events[0].id), str(tagged_events[2].id)]
+
+
+@pytest.mark.asyncio
+async def test_get_events_with_all_tags(default_client: httpx.AsyncClient, tagged_events: list) -> None:
+    response = await default_client.get("/event/?tags=python,fastapi&match=all")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(tagged_events[0].id)]
+
+
+@pytest.mark.asyncio
+async def test_get_events_with_empty_tags(default_client: httpx.AsyncClient, tagged_events: list) -> None:
+    response = await default_client.get("/event/?tags=,")
+
+    assert response.status_code == 200
+    assert [event["_id"] for event in response.json()] == [str(event.id) for event in tagged_events]
+
+
+@pytest.mark.asyncio
+async def test_stale_value_refreshes_once() -> None:
+    calls = []
+
+    async def load() -> list:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["python"]
+
+    value = RefreshingValue(load, interval=60)
+    results = await asyncio.gather(*(value.get() for _ in range(10)))
+
+    assert results == [["python"]] * 10
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_tag_counts(default_client: httpx.AsyncClient, tagged_events: list) -> None:
+    response = await default_client.get("/event/tags")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"tag": "python", "count": 2},
+        {"tag": "fastapi", "count": 1},
+        {"tag": "mongodb", "count": 1},
+    ]
@@ -0,0 +1,66 @@
+import time
+
+import httpx
+import pytest
+
+from auth.jwt_handler import create_access_token, token_cache
+from auth.token_cache import TokenCache
+from database import cache as cache_module
+from models.users import User
+
+
+def test_token_cache_roundtrip() -> None:
+    cache = TokenCache(User, max_entries=10)
+    data = {"user": "reader@packt.com", "expires": time.time() + 60}
+
+    cache.set("token", data, "user-id")
+
+    assert cache.get("token") == data
+    assert cache.get("other-token") is None
+
+
+def test_token_cache_skips_expired_tokens() -> None:
+    cache = TokenCache(User, max_entries=10)
+
+    cache.set("token", {"user": "reader@packt.com", "expires": time.time() - 1}, "user-id")
+
+    assert cache.get("token") is None
+
+
+def test_token_cache_caps_ttl(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TokenCache(User, max_entries=10, max_ttl=5)
+    cache.set("token", {"user": "reader@packt.com", "expires": time.time() + 3600}, "user-id")
+
+    now[0] += 4
+    assert cache.get("token") is not None
+    now[0] += 2
+    assert cache.get("token") is None
+
+
+def test_token_cache_invalidates_by_user() -> None:
+    cache = TokenCache(User, max_entries=10)
+    cache.set("token-a", {"user": "a@packt.com", "expires": time.time() + 60}, "user-a")
+    cache.set("token-b", {"user": "b@packt.com", "expires": time.time() + 60}, "user-b")
+
+    cache.invalidate("user-a")
+
+    assert cache.get("token-a") is None
+    assert cache.get("token-b") is not None
+
+
+@pytest.mark.asyncio
+async def test_revalidate_drops_deleted_users(default_client: httpx.AsyncClient) -> None:
+    user = User(email="shortlived@packt.com", password="hashed")
+    await User.insert_one(user)
+    token = create_access_token(user.email)
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await default_client.request("DELETE", "/event/bulk", json=[], headers=headers)
+    assert token_cache.get(token) is not None
+
+    await user.delete()
+    await token_cache.revalidate()
+
+    assert token_cache.get(token) is None